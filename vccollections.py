@@ -2,18 +2,34 @@ from __future__ import annotations
 import sys
 import argparse
 import logging
+import queue
+import atexit
 import datetime
 import os
 import json
 import anticrlf
 import csv
-import math
+import functools
+import hashlib
 from base64 import b64decode
+from logging.handlers import QueueHandler, QueueListener
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from reportlab import rl_config
+# ReportLab validates every attribute set on a chart shape unless shapeChecking is off. The setting is read when
+# reportlab.graphics is imported, so the --debug flag is looked for here rather than after argument parsing
+rl_config.shapeChecking = int('--debug' in sys.argv[1:])
 
 from reportlab.lib import utils, colors
 from reportlab.lib.colors import HexColor, PCMYKColor
 from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image, Table, TableStyle, KeepTogether, HRFlowable
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image, Table, LongTable, TableStyle, KeepTogether, CondPageBreak, HRFlowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
 from reportlab.lib.units import inch
@@ -28,6 +44,11 @@ from veracode_api_py.apihelper import APIHelper
 
 log = logging.getLogger(__name__)
 
+# the API classes hold no per-call state, so one instance of each is shared by every call (and every worker thread)
+collections_api = Collections()
+findings_api = Findings()
+users_api = Users()
+
 # constants
 title = 'Veracode Collection Report'
 collection_name = ''
@@ -35,11 +56,20 @@ report_time = ''
 username = ''
 copyright_year = ''
 
+# findings are fetched concurrently, one application per worker; keep this modest to respect API rate limits
+findings_max_workers = 16
+
+# with --cache, findings downloaded today are kept here so later runs on the same day can skip the API. The files hold
+# full vulnerability details, so each set of API credentials gets its own folder
+findings_cache_dir = 'findings_cache'
+use_findings_cache = False
+
 # veracode_blue_color = (CMYKColor(44, 5, 0, 19))
 # veracode_blue_color = Color(45, 77, 81, 1)
 veracode_blue_color = (HexColor('#74c4ce', htmlOnly=True))
 
 printable_width = 0
+max_block_height = 10 * inch
 logo = os.path.join("resources", "veracode-black-hires.jpg")
 spacer = Spacer(1, 0.5 * inch)
 
@@ -64,6 +94,26 @@ styles.add(
     alias="hfr",
 )
 
+# look the styles up once; StyleSheet1 resolves aliases on every lookup
+normal_style = styles['Normal']
+body_text_style = styles['BodyText']
+title_style = styles['Title']
+h1_style = styles['h1']
+h1b_style = styles['h1b']
+h3_style = styles['h3']
+h4_style = styles['h4']
+h5_style = styles['h5']
+h5r_style = styles['h5r']
+hf_style = styles['hf']
+hfr_style = styles['hfr']
+nb_style = styles['nb']
+
+# styles for single report elements, built once instead of on every call
+collection_title_style = ParagraphStyle('CollectionTitle', nb_style, fontSize=12)
+normal_right_style = ParagraphStyle(name="NormalRight", parent=normal_style, alignment=TA_RIGHT)
+section_header_style = ParagraphStyle(name="headerStyle", parent=normal_style, fontSize=12)
+dynamic_table_title_style = ParagraphStyle(name="Detailed Findings Style", borderWidth=1, borderColor=colors.black)
+
 # ******************************* #
 # Mapping
 # ******************************* #
@@ -76,6 +126,24 @@ severity = {
     0: "Informational",
 }
 
+# keys of the findings-by-severity summaries, highest severity first
+severity_keys = tuple('sev{}'.format(sev) for sev in severity)
+severity_names = tuple(severity.values())
+
+# the API's status titles mix upper and lower case keys; normalise them once so each lookup is a single probe
+compliance_titles = {status.upper(): status_title for status, status_title in collections_api.compliance_titles.items()}
+# one-line explanation shown under the collection's compliance status in the executive summary
+compliance_descriptions = {
+    'OUT_OF_COMPLIANCE': 'one or more assets did not pass policy',
+    'DID_NOT_PASS': 'one or more assets did not pass policy',
+    'WITHIN_GRACE_PERIOD': 'one or more assets have policy violations within the remediation grace period',
+    'CONDITIONAL_PASS': 'one or more assets have policy violations within the remediation grace period',
+    'COMPLIANT': 'all assets passed policy',
+    'PASSED': 'all assets passed policy',
+    'NOT_ASSESSED': 'the assets have not been assessed against policy',
+    'NOT_EVALUATED': 'the assets have not been evaluated against policy',
+}
+
 severity_colors = (
     HexColor('#d13a85', htmlOnly=True),
     HexColor('#dc342e', htmlOnly=True),
@@ -91,6 +159,8 @@ compliance_colors = (
     HexColor('#3eb849', htmlOnly=True),
     HexColor('#cccccc', htmlOnly=True)
 )
+# legend labels for the compliance pie chart, in the same order as compliance_colors
+compliance_legend_labels = (" Did Not Pass", " Conditional Pass", " Passed", " Not Assessed")
 
 scan_type_names = {
     "STATIC": "Static",
@@ -103,6 +173,77 @@ didnotpassicon = os.path.join("resources", "fail.png")
 conditionalicon = os.path.join("resources", "conditional.png")
 passicon = os.path.join("resources", "pass.png")
 notassessicon = os.path.join("resources", "notassessed.png")
+didnotpassicon_small = os.path.join("resources", "small", "fail.png")
+conditionalicon_small = os.path.join("resources", "small", "conditional.png")
+passicon_small = os.path.join("resources", "small", "pass.png")
+
+# collection compliance status to the icon shown next to it; anything else is shown as not assessed
+status_icons = {
+    'OUT_OF_COMPLIANCE': didnotpassicon,
+    'WITHIN_GRACE_PERIOD': conditionalicon,
+    'COMPLIANT': passicon,
+}
+
+# the asset policy tables repeat the same few cells for every asset, so build them once
+asset_table_headers = [
+    Paragraph("<b>Asset</b>"),
+    Paragraph("<b>Rules</b>"),
+    Paragraph("<b>Scan Requirements</b>"),
+    Paragraph("<b>Last Scan Date</b>")
+]
+# status cells draw their icon inline rather than in a nested table, which keeps each asset row a single layout pass
+status_cell_markup = '<img src="{}" width="{}" height="{}" valign="middle"/>&nbsp;&nbsp;&nbsp;{}'
+passed_cell = Paragraph(status_cell_markup.format(passicon_small, 0.1 * inch, 0.1 * inch, 'Passed'), normal_style)
+within_grace_period_cell = Paragraph(status_cell_markup.format(conditionalicon_small, 0.1 * inch, 0.1 * inch, 'Within Grace Period'), normal_style)
+did_not_pass_cell = Paragraph(status_cell_markup.format(didnotpassicon_small, 0.1 * inch, 0.1 * inch, 'Did Not Pass'), normal_style)
+not_scanned_text = Paragraph('Not Scanned', normal_style)
+
+# findings table cells by (text, bold); tables wrap each cell again before drawing it, so one Paragraph can sit in
+# any number of cells. Cleared once the PDF is written
+paragraph_cache = {}
+
+# table styles used for every asset row, profile, findings table and page, so the same instances are shared by all of those tables
+asset_table_style = TableStyle([("VALIGN", (0, 0), (-1, -1), "MIDDLE")])
+profile_title_table_style = TableStyle(
+    [
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+        ("TOPPADDING", (0, 0), (-1, -1), 0),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+        ("ALIGN", (2, 0), (-1, -1), "RIGHT"),
+    ]
+)
+section_title_table_style = TableStyle(
+    [
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+    ]
+)
+cover_footer_table_style = TableStyle([('ALIGN', (1, 0), (-1, -1), 'LEFT')])
+right_column_table_style = TableStyle([('ALIGN', (1, 0), (-1, -1), 'RIGHT')])
+summary_wrap_table_style = TableStyle(
+    [
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("BOX", (0, 1), (-1, -1), 1.25, veracode_blue_color),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ]
+)
+findings_table_style = TableStyle(
+    [
+        ("SPAN", (0, 0), (-1, 0)),
+        ("ALIGNMENT", (0, 0), (-1, 0), "CENTER"),
+        ("BOX", (0, 0), (-1, 0), 1, colors.black),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]
+)
+dast_finding_table_style = TableStyle(
+    [
+        ("SPAN", (0, 0), (0, 0)),
+        ("ALIGNMENT", (0, 0), (-1, 0), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]
+)
 
 
 # ******************************* #
@@ -111,68 +252,98 @@ notassessicon = os.path.join("resources", "notassessed.png")
 
 
 def roundup(x, multipleOf):
-    if isinstance(x, int) or isinstance(x, float):
-        x = int(x)
+    x = int(x)
     if x == 0:
         return 0
-    return math.ceil(x / multipleOf) * multipleOf
+    # ceiling division on integers, without a round trip through float
+    return -(-x // multipleOf) * multipleOf
+
+
+def parse_api_timestamp(timestamp):
+    # fromisoformat is implemented in C and reads the API's ISO 8601 timestamps from Python 3.11 on
+    if sys.version_info >= (3, 11):
+        return datetime.datetime.fromisoformat(timestamp)
+    return datetime.datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%f%z')
+
+
+@functools.lru_cache(maxsize=4096)
+def format_scan_date(scan_date):
+    # each asset's last scan date is shown on the asset policy page and again on its profile page
+    return parse_api_timestamp(scan_date).strftime('%m-%d-%Y %H:%M')
+
+
+def dump_json(data, outfile):
+    # orjson is optional; it is much faster than json for the large collection files
+    if orjson is not None:
+        outfile.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode())
+    else:
+        json.dump(data, outfile)
+
+def load_json(infile):
+    if orjson is not None:
+        return orjson.loads(infile.read())
+    return json.load(infile)
+
+def get_asset_policy(asset_attributes):
+    # an asset without a policy has nothing to evaluate; don't let it stop the whole report
+    policies = asset_attributes.get('policies')
+    return policies[0] if policies else {}
 
 
 def get_icon_path_for_status(status):
-    match status:
-        case 'OUT_OF_COMPLIANCE':
-            return didnotpassicon
-        case 'WITHIN_GRACE_PERIOD':
-            return conditionalicon
-        case 'COMPLIANT':
-            return passicon
-        case _:
-            return notassessicon
+    return status_icons.get(status, notassessicon)
 
 # ******************************* #
 # Data collection section
 # ******************************* #
 
 
-def setup_logger():
+def setup_logger(debug=False):
     handler = logging.FileHandler('vccollections.log', encoding='utf8')
     handler.setFormatter(anticrlf.LogFormatter('%(asctime)s - %(levelname)s - %(funcName)s - %(message)s'))
+    # the findings worker threads log as they go; hand records to a background thread so they never wait on the file
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
     logger = logging.getLogger(__name__)
-    logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+
+
+def cache_api_credentials():
+    # every API call builds a new APIHelper, which re-reads the credentials and region unless they are set on the class
+    helper = APIHelper()
+    APIHelper.api_key_id = helper.api_key_id
+    APIHelper.api_key_secret = helper.api_key_secret
+    APIHelper.region = helper.region
 
 
 def creds_expire_days_warning():
     creds = vapi().get_creds()
-    exp = datetime.datetime.strptime(creds['expiration_ts'], "%Y-%m-%dT%H:%M:%S.%f%z")
+    exp = parse_api_timestamp(creds['expiration_ts'])
     delta = exp - datetime.datetime.now().astimezone()  #we get a datetime with timezone...
     if (delta.days < 7):
         print('These API credentials expire ', creds['expiration_ts'])
 
 
 def get_collection_information(collguid, scan_types, affects_policy):
-    collection_info = Collections().get(collguid)
-    assets = Collections().get_assets(collection_info.get('guid'))
+    collection_info = collections_api.get(collguid)
+    assets = collections_api.get_assets(collection_info.get('guid'))
     collection_info['asset_infos'] = assets
-    applications = [asset['guid'] for asset in assets]
-    findings_list = get_findings(applications, scan_types, affects_policy)
-    collection_info['collection_summary'] = findings_list.pop('collection_summary')
-    collection_info['collection_policy_summary'] = findings_list.pop('collection_policy_summary')
-    for asset in assets:
-        guid = asset.get('guid')
-        if guid in findings_list and 'asset_info' not in findings_list.get(guid):
-            finding = findings_list.get(guid)
-            finding['asset_info'] = asset
+    findings_list, collection_summary, collection_policy_summary = get_findings(assets, scan_types, affects_policy)
+    collection_info['collection_summary'] = collection_summary
+    collection_info['collection_policy_summary'] = collection_policy_summary
     collection_info['findings_list'] = findings_list
     return collection_info
 
 
 def get_self():
-    return Users().get_self()
+    return users_api.get_self()
 
 
 def get_collection_assets(collguid):
-    return Collections().get_assets(collguid)
+    return collections_api.get_assets(collguid)
 
 
 def get_finding_severity(finding):
@@ -181,61 +352,127 @@ def get_finding_severity(finding):
 
 def get_app_profile_summary_data(app_findings):
     app_summary_info = {}
-    allfindingsbysev = {}
-    allfindingsbysev['sev5'] = []
-    allfindingsbysev['sev4'] = []
-    allfindingsbysev['sev3'] = []
-    allfindingsbysev['sev2'] = []
-    allfindingsbysev['sev1'] = []
-    allfindingsbysev['sev0'] = []
-    policyfindingsbysev = {}
-    policyfindingsbysev['sev5'] = []
-    policyfindingsbysev['sev4'] = []
-    policyfindingsbysev['sev3'] = []
-    policyfindingsbysev['sev2'] = []
-    policyfindingsbysev['sev1'] = []
-    policyfindingsbysev['sev0'] = []
+    # only the counts are reported, so don't keep a second reference to every finding per severity
     app_findings.sort(key=get_finding_severity, reverse=True)
-    for finding in app_findings:
-        severity = finding["finding_details"]["severity"]
-        severityStr = str(severity)
-        allfindingsbysev['sev'+severityStr].append(finding)
-        if finding['violates_policy']:
-            policyfindingsbysev['sev'+severityStr].append(finding)
-
-    for findingSev in allfindingsbysev:
-        allfindingsbysev[findingSev] = len(allfindingsbysev[findingSev])
-
-    total_policy_findings = 0
-    for policyFindingSev in policyfindingsbysev:
-        findings_by_sev_lenth = len(policyfindingsbysev[policyFindingSev])
-        policyfindingsbysev[policyFindingSev] = findings_by_sev_lenth
-        total_policy_findings += findings_by_sev_lenth
-
-    app_summary_info['findings_by_severity'] = allfindingsbysev
-    app_summary_info['policy_findings_by_severity'] = policyfindingsbysev
+    allfindingsbysev = Counter(map(get_finding_severity, app_findings))
+    policyfindingsbysev = Counter(get_finding_severity(finding) for finding in app_findings if finding['violates_policy'])
+
+    app_summary_info['findings_by_severity'] = {'sev{}'.format(sev): allfindingsbysev[sev] for sev in severity}
+    app_summary_info['policy_findings_by_severity'] = {'sev{}'.format(sev): policyfindingsbysev[sev] for sev in severity}
     app_summary_info['total_findings'] = len(app_findings)
-    app_summary_info['total_policy_findings'] = total_policy_findings
+    app_summary_info['total_policy_findings'] = sum(app_summary_info['policy_findings_by_severity'].values())
     app_summary_info['app_findings'] = app_findings
     return app_summary_info
 
 
 def update_collection_findings_by_sev(collection_summary, app_findings_summary):
-    collection_summary['sev5'] = collection_summary.get('sev5', 0) + app_findings_summary['sev5']
-    collection_summary['sev4'] = collection_summary.get('sev4', 0) + app_findings_summary['sev4']
-    collection_summary['sev3'] = collection_summary.get('sev3', 0) + app_findings_summary['sev3']
-    collection_summary['sev2'] = collection_summary.get('sev2', 0) + app_findings_summary['sev2']
-    collection_summary['sev1'] = collection_summary.get('sev1', 0) + app_findings_summary['sev1']
-    collection_summary['sev0'] = collection_summary.get('sev0', 0) + app_findings_summary['sev0']
+    for sev_key, count in app_findings_summary.items():
+        collection_summary[sev_key] = collection_summary.get(sev_key, 0) + count
     return collection_summary
 
 
-def get_findings(apps, scan_types_requested, affects_policy):
-    status = "Getting findings for {} applications…".format(len(apps))
+@functools.lru_cache(maxsize=None)
+def get_findings_cache_dir():
+    # runs with different credentials may see different applications, so never share entries between API key ids
+    key_id_hash = hashlib.sha256(APIHelper.api_key_id.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(findings_cache_dir, key_id_hash)
+
+
+def get_findings_cache_path(app, last_scan_date, scan_types):
+    # a new scan changes the findings, so the last scan date is part of the key; only its letters and digits are kept
+    # to make a valid file name
+    scan_key = ''.join(filter(str.isalnum, last_scan_date))
+    return os.path.join(get_findings_cache_dir(), '{}-{}-{}-{}.json'.format(datetime.date.today().isoformat(), app, scan_key, scan_types.replace(',', '_')))
+
+
+def prune_findings_cache():
+    # entries are only reused on the day they were downloaded, so drop the older ones
+    cache_dir = get_findings_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return
+    today = datetime.date.today().isoformat()
+    for cache_file in os.listdir(cache_dir):
+        if not cache_file.startswith(today):
+            try:
+                os.remove(os.path.join(cache_dir, cache_file))
+            except OSError:
+                log.warning("Could not remove old findings cache file {}".format(cache_file), exc_info=True)
+
+
+def read_findings_cache(cache_path):
+    # a cache entry that can't be read is treated as missing, so the findings are downloaded again
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as cachefile:
+            return load_json(cachefile)
+    except Exception:
+        log.warning("Could not read findings cache file {}".format(cache_path), exc_info=True)
+        return None
+
+
+def write_findings_cache(cache_path, findings):
+    # the findings are already downloaded, so a failure here only costs the next run a request
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # write to a temporary file first so an interrupted run never leaves a partial entry behind
+        with open(cache_path + '.tmp', 'w', encoding='utf-8') as cachefile:
+            dump_json(findings, cachefile)
+        os.replace(cache_path + '.tmp', cache_path)
+    except Exception:
+        log.warning("Could not write findings cache file {}".format(cache_path), exc_info=True)
+
+
+def get_app_findings(app, last_scan_date, scan_types, params):
+    cache_path = get_findings_cache_path(app, last_scan_date, scan_types) if use_findings_cache else None
+    if cache_path and os.path.exists(cache_path):
+        cached_findings = read_findings_cache(cache_path)
+        if cached_findings is not None:
+            log.debug("Using cached {} findings for application {}".format(scan_types, app))
+            return cached_findings
+
+    log.debug("Getting {} findings for application {}".format(scan_types, app))
+    # get_findings adds its query arguments to request_params, so each call gets its own copy
+    this_app_findings = findings_api.get_findings(app, scan_types, True, dict(params))  # update to do by severity and policy status
+    if cache_path:
+        write_findings_cache(cache_path, this_app_findings)
+    return this_app_findings
+
+
+def get_findings_bulk(apps, scan_types_to_get, sca, params):
+    findings_requests = []
+    if scan_types_to_get:
+        findings_requests.append((','.join(scan_types_to_get), params))
+    # SCA findings call must be made by itself currently. See official docs: https://docs.veracode.com/r/c_findings_v2_intro
+    if sca:
+        findings_requests.append(('SCA', {}))  # API does not accept violates_policy request parameter
+
+    # the Findings API only returns findings for one application per request, so submit them all as one batch;
+    # the calls are network bound, so fetch them concurrently
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(findings_max_workers, len(apps) * len(findings_requests)))) as executor:
+        futures = {executor.submit(get_app_findings, app, last_scan_date, scan_types, scan_params): (app, scan_types)
+                   for app, last_scan_date in apps.items() for scan_types, scan_params in findings_requests}
+        for done, future in enumerate(as_completed(futures), start=1):
+            app, scan_types = futures[future]
+            try:
+                results[app, scan_types] = future.result()
+            except Exception:
+                # leave this application's findings out rather than losing the whole report
+                status = "Could not get {} findings for application {}, they will be missing from the report".format(scan_types, app)
+                log.exception(status)
+                print(status)
+                results[app, scan_types] = []
+            log.debug("Got {} findings for application {} ({} of {})".format(scan_types, app, done, len(futures)))
+
+    # put each application's findings back together in request order so the report doesn't depend on timing
+    return {app: [finding for scan_types, _ in findings_requests for finding in results[app, scan_types]] for app in apps}
+
+
+def get_findings(assets, scan_types_requested, affects_policy):
+    status = "Getting findings for {} applications…".format(len(assets))
     print(status)
     log.info(status)
-    collection_all_findings_summary = {}
-    collection_policy_summary = {}
+    collection_all_findings_summary = dict.fromkeys(severity_keys, 0)
+    collection_policy_summary = dict.fromkeys(severity_keys, 0)
     all_findings = {}
     sca = False
     scan_types_to_get = list(scan_types_requested)
@@ -246,34 +483,44 @@ def get_findings(apps, scan_types_requested, affects_policy):
     if affects_policy:
         # params = {"violates_policy": True}
         params = {}
-    for app in apps:
-        this_app_SCA_findings = []
-        log.debug("Getting findings for application {}".format(app))
-        this_app_findings = Findings().get_findings(app, ','.join(scan_types_to_get), True, params)  # update to do by severity and policy status
-        # SCA findings call must be made by itself currently. See official docs: https://docs.veracode.com/r/c_findings_v2_intro
-        if sca:
-            this_app_SCA_findings = Findings().get_findings(app, 'SCA', True)  # API does not accept violates_policy request parameter
-        if len(this_app_SCA_findings) > 0:
-            this_app_findings = this_app_findings + this_app_SCA_findings
-        this_app_findings = get_app_profile_summary_data(this_app_findings)
+    if use_findings_cache:
+        prune_findings_cache()
+    # an asset that has never been scanned has no findings, so don't spend a request on it
+    scanned_apps = {asset['guid']: asset['attributes']['last_completed_scan_date'] for asset in assets
+                    if asset['attributes'].get('last_completed_scan_date')}
+    apps_findings = get_findings_bulk(scanned_apps, scan_types_to_get, sca, params)
+    for asset in assets:
+        app = asset['guid']
+        this_app_findings = get_app_profile_summary_data(apps_findings.get(app, []))
+        this_app_findings['asset_info'] = asset
         collection_all_findings_summary = update_collection_findings_by_sev(collection_all_findings_summary, this_app_findings['findings_by_severity'])
         collection_policy_summary = update_collection_findings_by_sev(collection_policy_summary, this_app_findings['policy_findings_by_severity'])
         all_findings[app] = this_app_findings
 
-    all_findings['collection_summary'] = collection_all_findings_summary
-    all_findings['collection_policy_summary'] = collection_policy_summary
-    return all_findings
+    return all_findings, collection_all_findings_summary, collection_policy_summary
 
 # ******************************* #
 # PDF Generation section          #
 # ******************************* #
 
 
+@functools.lru_cache(maxsize=64)
+def get_image_reader(path):
+    # the same few logo and icon files are placed on every page, so only open each one once
+    return utils.ImageReader(path)
+
+
+def get_image_aspect(path):
+    iw, ih = get_image_reader(path).getSize()
+    return ih / float(iw)
+
+
 def get_image(path, width=1 * inch):
-    img = utils.ImageReader(path)
-    iw, ih = img.getSize()
-    aspect = ih / float(iw)
-    return Image(path, width=width, height=(width * aspect))
+    image = Image(path, width=width, height=(width * get_image_aspect(path)))
+    # JPEGs are embedded straight from the file; anything else would otherwise be decoded again for every Image
+    if not path.lower().endswith(('.jpg', '.jpeg')):
+        image._img = get_image_reader(path)
+    return image
 
 
 def cover_page(Story, user_name, report_time):
@@ -281,12 +528,12 @@ def cover_page(Story, user_name, report_time):
     Story.append(im)
     Story.append(spacer)
 
-    titleStyle = styles['Title']
+    titleStyle = title_style
     Title = Paragraph("Collection Security Report", titleStyle)
     Story.append(Title)
     Story.append(spacer)
 
-    style = styles['Normal']
+    style = normal_style
     collection_name_p = Paragraph(
         "<b>Collection name:</b> {}".format(collection_name), style
     )
@@ -299,9 +546,9 @@ def cover_page(Story, user_name, report_time):
 
     tableData = []
 
-    styleH5 = styles['h5']
+    styleH5 = h5_style
     section = Paragraph("Sections", styleH5)
-    page = Paragraph("Page", styles["h5r"])
+    page = Paragraph("Page", h5r_style)
 
     tableHeaders = [section, page]
 
@@ -327,21 +574,12 @@ def cover_page(Story, user_name, report_time):
     Story.append(PageBreak())
 
 def get_compliance_status_text(compliance_status):
-    lower_status = compliance_status.lower()
-    upper_status = compliance_status.upper()
-    if lower_status in Collections().compliance_titles:
-        return Collections().compliance_titles[lower_status]
-    elif upper_status in Collections().compliance_titles:
-        return Collections().compliance_titles[upper_status]
-    elif compliance_status in Collections().compliance_titles:
-        return Collections().compliance_titles[compliance_status]
-    else:
-        return ""
+    return compliance_titles.get(compliance_status.upper(), "")
 
 def executive_summary_page(Story, collection_info):
     compliance_status = collection_info.get('compliance_status')
     compliance_status_text = get_compliance_status_text(compliance_status)
-    compliance_status_description = 'one or more assets did not pass policy'
+    compliance_status_description = compliance_descriptions.get(compliance_status.upper(), '')
     collection_description = collection_info.get('description')
     findingsbysev = collection_info['collection_summary']
     policyfindingsbysev = collection_info['collection_policy_summary']
@@ -349,7 +587,7 @@ def executive_summary_page(Story, collection_info):
     compliance_overview = collection_info.get('compliance_overview')
 
     ## Executive Summary Title
-    sectionTitle = Paragraph("Executive Summary", styles["h1b"])
+    sectionTitle = Paragraph("Executive Summary", h1b_style)
     titleLayoutTableData = []
     titleLayoutTableData.append([sectionTitle])
     titleLayoutTable = Table(titleLayoutTableData, [1 * printable_width])
@@ -372,10 +610,9 @@ def executive_summary_page(Story, collection_info):
 
     ## Collection Summary middle column table
     middle_collectionInfoTableData = []
-    collection_title_style = ParagraphStyle('CollectionTitle', styles['nb'], fontSize=12)
     middle_collectionInfoTableData.append([Paragraph('Collection: ' + collection_name, collection_title_style)])
 
-    tableBodyTextStyle = styles['BodyText']
+    tableBodyTextStyle = body_text_style
     compliance_status_paragraph = Paragraph(
         "<b>Status: "
         + compliance_status_text
@@ -402,16 +639,10 @@ def executive_summary_page(Story, collection_info):
 
     ## Collection Summary right column table
     right_findingSummanyTableData = []
-    total_findings = 0
-    for sev in findingsbysev:
-        total_findings += findingsbysev[sev]
-
-    total_policy_findings = 0
-    for sev in policyfindingsbysev:
-        total_policy_findings += policyfindingsbysev[sev]
-    normalRightStyle = ParagraphStyle(name="NormalRight", parent=styles["Normal"], alignment=TA_RIGHT)
-    right_findingSummanyTableData.append([Paragraph('OPEN FINDINGS: ' + str(total_findings), normalRightStyle)])
-    right_findingSummanyTableData.append([Paragraph('FINDINGS IMPACTING POLICY: ' + str(total_policy_findings), normalRightStyle)])
+    total_findings = sum(findingsbysev.values())
+    total_policy_findings = sum(policyfindingsbysev.values())
+    right_findingSummanyTableData.append([Paragraph('OPEN FINDINGS: ' + str(total_findings), normal_right_style)])
+    right_findingSummanyTableData.append([Paragraph('FINDINGS IMPACTING POLICY: ' + str(total_policy_findings), normal_right_style)])
 
     right_findingSummanyTable = Table(right_findingSummanyTableData, [0.4 * printable_width])
     tRightStyle = TableStyle(
@@ -454,6 +685,10 @@ def compliance_summary_pie_chart(compliance_overview):
     not_assess = compliance_overview['not_assessed']
     compliance_data = [fail, conditional, passing, not_assess]
     total_assets = sum(compliance_data)
+    tableTitle = Paragraph('Compliance Overview', h3_style)
+    if total_assets == 0:
+        # a pie chart of nothing can't be drawn, so say so instead
+        return summary_table_wrap(Paragraph('No assets assessed'), tableTitle)
 
     d = Drawing(0.4 * printable_width, 0.35 * printable_width)
 
@@ -483,43 +718,28 @@ def compliance_summary_pie_chart(compliance_overview):
     legend.deltay = 10
     legend.strokeWidth = 0
     legend.strokeColor = None
-    itemLabels = [
-        (get_compliance_percent_string(fail, total_assets), " Did Not Pass"),
-        (get_compliance_percent_string(conditional, total_assets), " Conditional Pass"),
-        (get_compliance_percent_string(passing, total_assets), " Passed"),
-        (get_compliance_percent_string(not_assess, total_assets), " Not Assessed"),
-    ]
-    items = []
+    legend.colorNamePairs = [(color, (get_compliance_percent_string(count, total_assets), label))
+                             for color, count, label in zip(compliance_colors, compliance_data, compliance_legend_labels)]
     for i, color in enumerate(compliance_colors):
-        items.append((color, itemLabels[i]))
         pc.slices[i].fillColor = color
-    legend.colorNamePairs = items
     legend.subCols[1].align = "left"
     d.add(legend)
     d.add(pc)
 
-    tableTitle = Paragraph('Compliance Overview', styles['h3'])
     wrappingTable = summary_table_wrap(d, tableTitle)
 
     return wrappingTable
 
 
 def get_compliance_percent_string(current, total):
-    return "{}%".format(str(round((current / total) * 100, 2)))
+    if total == 0:
+        return "0%"
+    return f"{round(current / total * 100, 2)}%"
 
 
 def findings_summary_chart(findingsbysev):
 
-    openFindingsData = [
-        (
-            findingsbysev["sev5"],
-            findingsbysev["sev4"],
-            findingsbysev["sev3"],
-            findingsbysev["sev2"],
-            findingsbysev["sev1"],
-            findingsbysev["sev0"],
-        )
-    ]
+    openFindingsData = [tuple(findingsbysev[sev_key] for sev_key in severity_keys)]
 
     drawing = Drawing(0.4 * printable_width, 0.35 * printable_width)
     bc = VerticalBarChart()
@@ -539,11 +759,9 @@ def findings_summary_chart(findingsbysev):
         bc.bars[0, i].fillColor = color
 
     # Calculate step intervals and upper boundaries for chart
-    max_value = 0
-    for row in openFindingsData:
-        new_max_value = max(row)
-        max_value = max([new_max_value, max_value])
-    step_interval = roundup(max_value, 10) / 5
+    max_value = max(openFindingsData[0])
+    # roundup(..., 10) is a multiple of 10, so the step is always a whole number
+    step_interval = roundup(max_value, 10) // 5
     upper_bound = roundup(max_value, step_interval) + 35
     if upper_bound == 0:
         upper_bound = 100
@@ -571,16 +789,9 @@ def findings_summary_chart(findingsbysev):
     bc.categoryAxis.labels.angle = 45
     bc.categoryAxis.visibleTicks = 0
     bc.categoryAxis.visibleAxis = 0
-    bc.categoryAxis.categoryNames = [
-        severity[5],
-        severity[4],
-        severity[3],
-        severity[2],
-        severity[1],
-        severity[0],
-    ]
+    bc.categoryAxis.categoryNames = list(severity_names)
     drawing.add(bc)
-    tableTitle = Paragraph('Open Findings Impacting Policy', styles['h3'])
+    tableTitle = Paragraph('Open Findings Impacting Policy', h3_style)
     wrappingTable = summary_table_wrap(drawing, tableTitle)
     return wrappingTable
 
@@ -590,274 +801,192 @@ def summary_table_wrap(drawing, tableTitle):
     wrappingTableData.append([tableTitle])
     wrappingTableData.append([drawing])
     wrappingTable = Table(wrappingTableData, [0.45 * printable_width])
-    wrappingTableStyle = TableStyle(
-        [
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("BOX", (0, 1), (-1, -1), 1.25, veracode_blue_color),
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ]
-    )
-    wrappingTable.setStyle(wrappingTableStyle)
+    wrappingTable.setStyle(summary_wrap_table_style)
     wrappingTable.hAlign = 'LEFT'
     return wrappingTable
 
 
+# compliance status, compliance_overview count, icon and description for each asset policy section, in report order
+asset_policy_sections = (
+    ('DID_NOT_PASS', 'not_passing_policy', didnotpassicon,
+     'These assets have findings that violate policy rules and exceeded the remediation grace period or they have not been scanned at the required frequency.'),
+    ('CONDITIONAL_PASS', 'conditionally_passing_policy', conditionalicon,
+     'These assets have findings that violate policy rules and are within the remediation grace period and they have been scanned at the required frequency'),
+    ('PASSED', 'passing_policy', passicon,
+     'These assets passed all the aspects of the policy, including rules and required scans.'),
+    ('NOT_ASSESSED', 'not_assessed', notassessicon,
+     'These assets have not been scanned.'),
+)
+
+
 def asset_policy_evaluation_page(Story, collection_info):
     assets = collection_info.get('asset_infos')
 
-    sectionTitle = Paragraph("Asset Policy Evaluation", styles["h1"])
+    sectionTitle = Paragraph("Asset Policy Evaluation", h1_style)
     Story.append(sectionTitle)
     Story.append(spacer)
 
-    not_passed = collection_info['compliance_overview']['not_passing_policy']
-    conditional = collection_info['compliance_overview']['conditionally_passing_policy']
-    passed = collection_info['compliance_overview']['passing_policy']
-    not_assessed = collection_info['compliance_overview']['not_assessed']
-
-    if not_passed > 0:
-        # section - did not pass
-        didnotpasstext = 'These assets have findings that violate policy rules and exceeded the remediation grace period or they have not been scanned at the required frequency.'
-        asset_policy_evaluation_section(Story, 'DID_NOT_PASS', didnotpassicon, didnotpasstext, assets)
-
-    if conditional > 0:
-        # section - conditional
-        conditionaltext = 'These assets have findings that violate policy rules and are within the remediation grace period and they have been scanned at the required frequency'
-        asset_policy_evaluation_section(Story, 'CONDITIONAL_PASS', conditionalicon, conditionaltext, assets)
-
-    if passed > 0:
-        # section - passed
-        passedtext = 'These assets passed all the aspects of the policy, including rules and required scans.'
-        asset_policy_evaluation_section(Story, 'PASSED', passicon, passedtext, assets)
-
-    if not_assessed > 0:
-        # section - not assessed
-        notassessedtext = 'These assets have not been scanned.'
-        asset_policy_evaluation_section(Story, 'NOT_ASSESSED', notassessicon, notassessedtext, assets)
+    # group the assets by status once rather than scanning every asset for each section
+    assets_by_status = defaultdict(list)
+    for asset in assets:
+        assets_by_status[get_asset_policy(asset['attributes']).get('policy_compliance_status', 'NOT_ASSESSED')].append(asset)
+
+    for compliance_type, overview_key, icon, descriptiontext in asset_policy_sections:
+        if collection_info['compliance_overview'][overview_key] > 0:
+            asset_policy_evaluation_section(Story, compliance_type, icon, descriptiontext, assets_by_status[compliance_type])
     Story.append(PageBreak())
 
 
 def asset_policy_evaluation_section(Story, compliance_type, icon, descriptiontext, assets):
-    headerStyle = ParagraphStyle(
-        name="headerStyle", parent=styles["Normal"], fontSize=12
-    )
     section_header = Paragraph(
-        Collections().compliance_titles[compliance_type.upper()], headerStyle
+        compliance_titles[compliance_type], section_header_style
     )
     sectionTitleTableData = []
     im = get_image(icon, .2*inch)
     sectionTitleTableData.append([im, section_header])
     sectionTitleTable = Table(sectionTitleTableData, [0.4*inch, 3*inch])
-    sectionTitleTableStyle = TableStyle(
-        [
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-        ]
-    )
-    sectionTitleTable.setStyle(sectionTitleTableStyle)
+    sectionTitleTable.setStyle(section_title_table_style)
     sectionTitleTable.hAlign = 'LEFT'
     Story.append(sectionTitleTable)
 
     Story.append(Paragraph(descriptiontext))
     Story.append(Spacer(1, 0.25*inch))
-    Story.append(profile_summary_table(compliance_type, assets))
+    Story.append(profile_summary_table(assets))
     Story.append(spacer)
 
 
-def profile_summary_table(compliance_type, assets):
-    assetTableData = []
-    assetTableData.append(
-        [
-            Paragraph("<b>Asset</b>"),
-            Paragraph("<b>Rules</b>"),
-            Paragraph("<b>Scan Requirements</b>"),
-            Paragraph("<b>Last Scan Date</b>")
-        ]
-    )
+def rules_status_cell(attrs):
+    if attrs.get('policy_passed_rules'):
+        return passed_cell
+    if attrs.get('policy_in_grace_period'):
+        return within_grace_period_cell
+    return did_not_pass_cell
+
+
+def scan_status_cell(attrs):
+    if attrs.get('policy_passed_scan_requirements'):
+        return passed_cell
+    return did_not_pass_cell
 
-    pass_icon = get_image(os.path.join("resources", "small", "pass.png"), 0.1 * inch)
-    conditional_icon = get_image(os.path.join("resources", "small", "conditional.png"), 0.1 * inch)
-    fail_icon = get_image(os.path.join("resources", "small", "fail.png"), 0.1 * inch)
-    tableStyle = TableStyle([("VALIGN", (0, 0), (-1, -1), "MIDDLE")])
-    ps = styles['Normal']
+
+def last_scan_date_cell(attrs):
+    scan_date = attrs.get('last_completed_scan_date')
+    if scan_date:
+        return Paragraph(format_scan_date(scan_date), normal_style)
+    return not_scanned_text
+
+
+def profile_summary_table(assets):
+    ps = normal_style
     # ps.fontSize = 10
-    for asset in assets:
-        if asset["attributes"]["policies"][0]["policy_compliance_status"] == compliance_type or compliance_type is None:
-            status_rules = asset['attributes'].get('policy_passed_rules')
-            status_scan = asset['attributes'].get('policy_passed_scan_requirements')
-            status_grace = asset['attributes'].get('policy_in_grace_period')
-            scan_date = asset['attributes'].get('last_completed_scan_date')
-            if status_rules:
-                rules_icon = pass_icon
-                rules_text = Paragraph('Passed', ps)
-            elif status_grace:
-                rules_icon = conditional_icon
-                rules_text = Paragraph('Within Grace Period', ps)
-            else:
-                rules_icon = fail_icon
-                rules_text = Paragraph('Did Not Pass', ps)
-            if status_scan:
-                scan_icon = pass_icon
-                scan_text = Paragraph('Passed', ps)
-            else:
-                scan_icon = fail_icon
-                scan_text = Paragraph('Did Not Pass', ps)
-
-            if scan_date:                
-                date_unfiltered = scan_date
-                datetimeobj = datetime.datetime.strptime(date_unfiltered, '%Y-%m-%dT%H:%M:%S.%f%z')
-                date_text = Paragraph(datetime.datetime.strftime(datetimeobj, '%m-%d-%Y %H:%M'), ps) 
-            else:
-                date_text = Paragraph('Not Scanned', ps)
-
-            rulesCellTableData = []
-            rulesCellTableData.append([rules_icon, rules_text])
-            rulesCellTable = Table(rulesCellTableData, [0.03 * printable_width, 0.22 * printable_width])
-            rulesCellTableStyle = TableStyle(
-                [
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                    ("TOPPADDING", (0, 0), (-1, -1), 0),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                ]
-            )
-            rulesCellTable.setStyle(rulesCellTableStyle)
-
-            scanCellTableData = []
-            scanCellTableData.append([scan_icon, scan_text])
-            scanCellTable = Table(scanCellTableData, [0.03 * printable_width, 0.22 * printable_width])
-            scanCellTableStyle = TableStyle(
-                [
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                    ("TOPPADDING", (0, 0), (-1, -1), 0),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                ]
-            )
-            scanCellTable.setStyle(scanCellTableStyle)
-            assetName = Paragraph(asset['name'], ps)
-            assetTableData.append([assetName, rulesCellTable, scanCellTable, date_text])
+    assetTableData = [asset_table_headers] + [[Paragraph(asset['name'], ps),
+                                               rules_status_cell(asset['attributes']),
+                                               scan_status_cell(asset['attributes']),
+                                               last_scan_date_cell(asset['attributes'])] for asset in assets]
 
     assetTable = Table(assetTableData, [0.3*printable_width, 0.25 * printable_width, 0.25 * printable_width, 0.2 * printable_width])
 
-    assetTable.setStyle(tableStyle)
+    assetTable.setStyle(asset_table_style)
     return assetTable
 
 
 def profile_pages(Story, collection_info):
     findings_list = collection_info.get('findings_list')
 
-    sectionTitle = Paragraph('Profile Summaries', styles['h1'])
+    sectionTitle = Paragraph('Profile Summaries', h1_style)
     Story.append(sectionTitle)
     Story.append(spacer)
-    for profile in findings_list:
-        if profile != 'collection_summary':
-            profile_summary_section(Story, findings_list[profile])
-            profile_details_section(Story, findings_list[profile])
-            Story.append(PageBreak())
+    for profile in findings_list.values():
+        profile_summary_section(Story, profile)
+        profile_details_section(Story, profile)
+        Story.append(PageBreak())
 
 
 def profile_summary_section(Story, profile):
     summary_data = []
-    pass_icon = os.path.join('resources', 'pass.png')
-    conditional_icon = os.path.join('resources', 'conditional.png')
-    fail_icon = os.path.join('resources', 'fail.png')
-    not_assess_icon = os.path.join('resources', 'notassessed.png')
     asset_info = profile['asset_info']
     asset_attributes = asset_info['attributes']
-    display_icon = not_assess_icon
+    display_icon = notassessicon
     if (asset_attributes['last_completed_scan_date'] is None):
-        display_icon = not_assess_icon
+        display_icon = notassessicon
     elif (asset_attributes['policy_passed_scan_requirements']):
         if (asset_attributes['policy_passed_rules']):
-            display_icon = pass_icon
+            display_icon = passicon
         elif (asset_attributes['policy_in_grace_period']):
-            display_icon = conditional_icon
+            display_icon = conditionalicon
         else:
-            display_icon = fail_icon
+            display_icon = didnotpassicon
     else:
-        display_icon = fail_icon
+        display_icon = didnotpassicon
     icon = get_image(display_icon, .2*inch)
-    profileName = Paragraph(profile['asset_info']['name'], styles['h3'])
-    policyName = asset_attributes['policies'][0]['name']
-    policy = Paragraph('<b>Policy:</b> {}'.format(policyName), styles['Normal'])
+    profileName = Paragraph(asset_info['name'], h3_style)
+    policyName = get_asset_policy(asset_attributes).get('name', '')
+    policy = Paragraph('<b>Policy:</b> {}'.format(policyName), normal_style)
     titleCellTableData = []
     titleCellTableData.append([icon, profileName, policy])
     titleCellTable = Table(titleCellTableData, [0.05 * printable_width, 0.4 * printable_width, 0.5 * printable_width])
-    titleCellTableStyle = TableStyle(
-        [
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("LEFTPADDING", (0, 0), (-1, -1), 0),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-            ("TOPPADDING", (0, 0), (-1, -1), 0),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-            ("ALIGN", (2, 0), (-1, -1), "RIGHT"),
-        ]
-    )
-    titleCellTable.setStyle(titleCellTableStyle)
+    titleCellTable.setStyle(profile_title_table_style)
     titleCellTable.hAlign = 'LEFT'
 
     summary_data.append(titleCellTable)
     summary_data.append(Spacer(1, .25*inch))
-    summary_table = profile_summary_table(None, [asset_info])
+    summary_table = profile_summary_table([asset_info])
     summary_data.append(summary_table)
     summary_data.append(Spacer(1, .25*inch))
     findings_summary_table = findings_summary_chart(profile['findings_by_severity'])
     summary_data.append(findings_summary_table)
-    Story.append(KeepTogether(summary_data))
+    # reserve the measured height of the block rather than using KeepTogether, which lays the block out again
+    # whenever it has to try the next page
+    block_height = sum(part.wrap(printable_width, max_block_height)[1] for part in summary_data)
+    Story.append(CondPageBreak(block_height))
+    Story.extend(summary_data)
     Story.append(Spacer(1, .25*inch))
 
 def append_for_scan_type(scan_type, f, findingsTableArray, is_first_dast_finding):
     if scan_type == 'DYNAMIC':
         findingsTableArray[scan_type].append(dynamic_finding_data_rows(f, is_first_dast_finding))
         return False
-    match scan_type:
-        case "STATIC":
-            data_row = static_findings_data_row(f)
-        case 'SCA':
-            data_row = sca_findings_data_row(f)
-        case 'MANUAL':
-            data_row = manual_findings_data_row(f)
+    row_builder = findings_row_builders.get(scan_type)
+    if row_builder is None:
+        return is_first_dast_finding
+    data_row = row_builder(f)
     if len(data_row) > 0:
         findingsTableArray[scan_type].append(data_row) 
     return is_first_dast_finding
 
 def profile_details_section(Story, profile):
     findings = profile['app_findings']
+    if not findings:
+        return
     is_first_dast_finding = True
-    if len(findings) > 0:
-        sectionTitle = Paragraph('Detailed Findings', styles['h3'])
-        Story.append(sectionTitle)
-        Story.append(Spacer(1, .25*inch))
-        findingsTableArray = {}
-        for f in findings:
-            scan_type = f['scan_type']
-            if (findingsTableArray.get(scan_type) is None):
-                findingsTableArray[scan_type] = []
-            is_first_dast_finding = append_for_scan_type(scan_type, f, findingsTableArray, is_first_dast_finding)            
-        for scan_type in findingsTableArray:
-            if (len(findingsTableArray[scan_type]) > 1):
-                findingTable = findings_table_generation(findingsTableArray[scan_type], scan_type)
-                Story.extend(findingTable)
-                Story.append(Spacer(1, .25*inch))
+    sectionTitle = Paragraph('Detailed Findings', h3_style)
+    Story.append(sectionTitle)
+    Story.append(Spacer(1, .25*inch))
+    findingsTableArray = defaultdict(list)
+    for f in findings:
+        scan_type = f['scan_type']
+        is_first_dast_finding = append_for_scan_type(scan_type, f, findingsTableArray, is_first_dast_finding)            
+    # only scan types with at least one finding have a bucket, so every bucket gets a table
+    for scan_type, rows in findingsTableArray.items():
+        Story.extend(findings_table_generation(rows, scan_type))
         Story.append(Spacer(1, .25*inch))
+    Story.append(Spacer(1, .25*inch))
 
 
 def wrap_row_data(rowData, bold, is_table=False):
-    lead_text = ''
-    trail_text = ''
-    if bold:
-        lead_text = '<b>'
-        trail_text = '</b>'
-    new_row_data = []
-    for item in rowData:
-        if isinstance(item, int) or isinstance(item, float):
-            item = str(item)
-        new_row_data.append(Paragraph(lead_text+item+trail_text))
+    # severities, statuses and CWEs repeat across findings, so parse each distinct cell text only once
+    cached_paragraph = paragraph_cache.get
+    new_row_data = [cached_paragraph((text, bold)) or new_cell_paragraph(text, bold) for text in map(str, rowData)]
     return [new_row_data] if is_table else new_row_data
 
 
+def new_cell_paragraph(text, bold):
+    paragraph = paragraph_cache[text, bold] = Paragraph(f'<b>{text}</b>' if bold else text)
+    return paragraph
+
+
+# the header rows never change, so build each one once; tables copy their rows, so sharing them is safe
+@functools.lru_cache(maxsize=1)
 def static_findings_table_headers():
     staticTableHeaders = [
                 "Flaw Id",
@@ -872,6 +1001,7 @@ def static_findings_table_headers():
     return [wrap_row_data(staticTableHeaders, True)]
 
 
+@functools.lru_cache(maxsize=1)
 def dynamic_findings_table_headers():
     dynamicTableHeaders = [
                 "Flaw Id",
@@ -885,6 +1015,7 @@ def dynamic_findings_table_headers():
     return [wrap_row_data(dynamicTableHeaders, True)]
 
 
+@functools.lru_cache(maxsize=1)
 def sca_findings_table_headers():
     scaTableHeaders = [
                 "CWE #",
@@ -900,6 +1031,7 @@ def sca_findings_table_headers():
     return [wrap_row_data(scaTableHeaders, True)]
 
 
+@functools.lru_cache(maxsize=1)
 def manual_findings_table_headers():
     manualTableHeaders = [
                 "Flaw Id",
@@ -915,18 +1047,25 @@ def manual_findings_table_headers():
 
 
 def static_findings_data_row(f):
+    fd = f['finding_details']
+    fs = f['finding_status']
     data_row = [
         f.get('issue_id', ''),
-        severity[f['finding_details']['severity']],
-        f['finding_details']['cwe']['id'],
-        f['finding_details']['cwe']['name'],
-        f['finding_details'].get('file_path', ''),
-        f['finding_details'].get('file_line_number', ''),
-        f['finding_status']['status'].capitalize(),
-        f['finding_status']['resolution'].capitalize()
+        severity[fd['severity']],
+        fd['cwe']['id'],
+        fd['cwe']['name'],
+        fd.get('file_path', ''),
+        fd.get('file_line_number', ''),
+        capitalize_status(fs['status']),
+        capitalize_status(fs['resolution'])
     ]
     return wrap_row_data(data_row, False)
 
+@functools.lru_cache(maxsize=64)
+def capitalize_status(status):
+    # finding statuses and resolutions only take a handful of values
+    return status.capitalize()
+
 def get_cwe_information(cwe_id):
     uri = f"appsec/v1/cwes/{cwe_id}"
     return APIHelper()._rest_request(uri,"GET")
@@ -946,18 +1085,11 @@ def get_remediation_effort(remediation_int):
     return "undefined"
 
 def make_table_for_dast(elements, column_widths):
-    tableStyle = TableStyle(
-        [
-            ("SPAN", (0, 0), (0, 0)),
-            ("ALIGNMENT", (0, 0), (-1, 0), "CENTER"),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ]
-    )
     return Table(
         elements,
         column_widths,
         None,
-        tableStyle,
+        dast_finding_table_style,
     )
 
 def try_decode(element):
@@ -967,27 +1099,29 @@ def try_decode(element):
         return element
 
 def get_dynamic_table_title():
-    return [[Paragraph('<b>Detailed Dynamic Findings</b>', style=ParagraphStyle(name="Detailed Findings Style", borderWidth=1, borderColor=colors.black))]]
+    return [[Paragraph('<b>Detailed Dynamic Findings</b>', style=dynamic_table_title_style)]]
 
 def dynamic_finding_data_rows(f, is_first_dast_finding):
+    fd = f['finding_details']
+    fs = f['finding_status']
     first_row = [
         f.get('issue_id', ''),
-        severity[f['finding_details']['severity']],
-        f['finding_details']['cwe']['id'],
-        f['finding_details']['cwe']['name'],        
-        f['finding_details']['finding_category']['name'],
-        f['finding_status']['status'].capitalize(),
-        f['finding_status']['resolution'].capitalize()
+        severity[fd['severity']],
+        fd['cwe']['id'],
+        fd['cwe']['name'],        
+        fd['finding_category']['name'],
+        capitalize_status(fs['status']),
+        capitalize_status(fs['resolution'])
     ]
 
     second_row = [
         "<b>Target URL:</b>",
-        f['finding_details'].get('hostname', '') + f['finding_details'].get('path', ''),
+        fd.get('hostname', '') + fd.get('path', ''),
         "<b>Vulnerable Parameter:</b>",
-        f['finding_details'].get('vulnerable_parameter', ''),
+        fd.get('vulnerable_parameter', ''),
     ]
 
-    cwe_information = get_cwe_information(f['finding_details']['cwe']['id'])
+    cwe_information = get_cwe_information(fd['cwe']['id'])
     third_row = [
         "<b>Effort to fix:</b>",
         get_remediation_effort(cwe_information["remediation_effort"]),
@@ -1004,7 +1138,9 @@ def dynamic_finding_data_rows(f, is_first_dast_finding):
     column_widths = get_column_widths_for_scan_type("DYNAMIC")
     header_row = dynamic_findings_table_headers()
 
-    return KeepTogether((make_table_for_dast(get_dynamic_table_title(), [pw])) if is_first_dast_finding else [] + [
+    # only the first dynamic finding carries the section title
+    title = [make_table_for_dast(get_dynamic_table_title(), [pw])] if is_first_dast_finding else []
+    return KeepTogether(title + [
         make_table_for_dast(header_row, column_widths),
         HRFlowable(width=pw, thickness=1, lineCap='round', color=colors.black, spaceBefore=1, spaceAfter=1, hAlign='CENTER', vAlign='BOTTOM', dash=None),
         make_table_for_dast(wrap_row_data(first_row, False, True), column_widths), 
@@ -1018,130 +1154,139 @@ def dynamic_finding_data_rows(f, is_first_dast_finding):
     ])
 
 def sca_findings_data_row(f):
+    fd = f['finding_details']
+    fs = f['finding_status']
+    cwe = fd.get('cwe', {})
     data_row = [
-        f['finding_details'].get('cwe', {}).get('id', ''),
-        f['finding_details'].get('cwe', {}).get('name', ''),
-        f['finding_details']['cve']['name'],
-        f['finding_details']['cve']['cvss'],
-        severity[f['finding_details']['severity']],
-        f['finding_details'].get('component_filename', ''),
-        f['finding_details'].get('version', ''),
-        f['finding_status']['status'].capitalize(),
-        f['finding_status']['resolution'].capitalize()
+        cwe.get('id', ''),
+        cwe.get('name', ''),
+        fd['cve']['name'],
+        fd['cve']['cvss'],
+        severity[fd['severity']],
+        fd.get('component_filename', ''),
+        fd.get('version', ''),
+        capitalize_status(fs['status']),
+        capitalize_status(fs['resolution'])
     ]
     return wrap_row_data(data_row, False)
 
 
 def manual_findings_data_row(f):
+    fd = f['finding_details']
+    fs = f['finding_status']
     data_row = [
         f.get('issue_id', ''),
-        severity[f['finding_details']['severity']],
-        f['finding_details']['cwe']['id'],
-        f['finding_details']['cwe']['name'],
-        f['finding_details'].get('input_vector', ''),
+        severity[fd['severity']],
+        fd['cwe']['id'],
+        fd['cwe']['name'],
+        fd.get('input_vector', ''),
         f['description'],
-        f['finding_status']['status'].capitalize(),
-        f['finding_status']['resolution'].capitalize()
+        capitalize_status(fs['status']),
+        capitalize_status(fs['resolution'])
     ]
     return wrap_row_data(data_row, False)
 
 
+# column widths of each findings table, as fractions of the printable width
+findings_column_fractions = {
+    "STATIC": (
+        0.08,  # Flaw ID
+        0.12,  # Severity
+        0.08,  # CWE #
+        0.25,  # CWE Name
+        0.15,  # File Path
+        0.08,  # Line #
+        0.1,  # Status
+        0.14,  # Resolution
+    ),
+    "DYNAMIC": (
+        0.08,  # Flaw ID
+        0.12,  # Severity
+        0.08,  # CWE #
+        0.25,  # CWE Name
+        0.23,  # Finding Category
+        0.1,  # Status
+        0.14,  # Resolution
+    ),
+    "SCA": (
+        0.08,  # CWE #
+        0.15,  # CWE Name
+        0.1,  # CVE #
+        0.08,  # CVSS Score
+        0.12,  # Severity
+        0.13,  # Component Name
+        0.1,  # Version
+        0.1,  # Status
+        0.14,  # Resolution
+    ),
+    "MANUAL": (
+        0.08,  # Flaw ID
+        0.12,  # Severity
+        0.08,  # CWE #
+        0.11,  # CWE Name
+        0.1,  # Input Vector
+        0.27,  # Description
+        0.1,  # Status
+        0.15,  # Resolution
+    ),
+}
+default_findings_column_fractions = (
+    0.08,  # Flaw ID
+    0.12,  # Severity
+    0.05,  # CWE #
+    0.3,  # CWE Name
+    0.2,  # File Path
+    0.1,  # Line #
+    0.1,  # Status
+    0.14,  # Resolution
+)
+
+findings_table_headers = {
+    "STATIC": static_findings_table_headers,
+    "DYNAMIC": dynamic_findings_table_headers,
+    "SCA": sca_findings_table_headers,
+    "MANUAL": manual_findings_table_headers,
+}
+
+# DYNAMIC findings are laid out as a block of tables each, see dynamic_finding_data_rows
+findings_row_builders = {
+    "STATIC": static_findings_data_row,
+    "SCA": sca_findings_data_row,
+    "MANUAL": manual_findings_data_row,
+}
+
+
+@functools.lru_cache(maxsize=16)
+def scale_column_widths(scan_type, pw):
+    # a tuple, so the tables sharing it can't change it
+    return tuple(fraction * pw for fraction in findings_column_fractions.get(scan_type, default_findings_column_fractions))
+
+
 def get_column_widths_for_scan_type(scan_type):
-    pw = printable_width
-    match scan_type:
-        case "STATIC":
-            return [
-                0.08 * pw,  # Flaw ID
-                0.12 * pw,  # Severity
-                0.08 * pw,  # CWE #
-                0.25 * pw,  # CWE Name
-                0.15 * pw,  # File Path
-                0.08 * pw,  # Line #
-                0.1 * pw,  # Status
-                0.14 * pw,  # Resolution
-            ]
-        case "DYNAMIC":
-            return [
-                0.08 * pw,  # Flaw ID
-                0.12 * pw,  # Severity
-                0.08 * pw,  # CWE #
-                0.25 * pw,  # CWE Name
-                0.23 * pw,  # Finding Category
-                0.1 * pw,  # Status
-                0.14 * pw,  # Resolution
-            ]
-        case "SCA":
-            return [
-                0.08 * pw,  # CWE #
-                0.15 * pw,  # CWE Name
-                0.1 * pw,  # CVE #
-                0.08 * pw,  # CVSS Score
-                0.12 * pw,  # Severity
-                0.13 * pw,  # Component Name
-                0.1 * pw,  # Version
-                0.1 * pw,  # Status
-                0.14 * pw,  # Resolution
-            ]
-        case "MANUAL":
-            return [
-                0.08 * pw,  # Flaw ID
-                0.12 * pw,  # Severity
-                0.08 * pw,  # CWE #
-                0.11 * pw,  # CWE Name
-                0.1 * pw,  # Input Vector
-                0.27 * pw,  # Description
-                0.1 * pw,  # Status
-                0.15 * pw,  # Resolution
-            ]
-        case _:
-            return [
-                0.08 * pw,  # Flaw ID
-                0.12 * pw,  # Severity
-                0.05 * pw,  # CWE #
-                0.3 * pw,  # CWE Name
-                0.2 * pw,  # File Path
-                0.1 * pw,  # Line #
-                0.1 * pw,  # Status
-                0.14 * pw,  # Resolution
-            ]
+    # printable_width only changes with the page orientation, so each table shape is only worked out once
+    return scale_column_widths(scan_type, printable_width)
 
 
 def get_table_header_for_scan_type(scan_type):
-    match scan_type:
-        case "STATIC":
-            return static_findings_table_headers()
-        case "DYNAMIC":
-            return dynamic_findings_table_headers()
-        case "SCA":
-            return sca_findings_table_headers()
-        case "MANUAL":
-            return manual_findings_table_headers()
-        case _: return []
+    table_headers = findings_table_headers.get(scan_type)
+    return table_headers() if table_headers else []
 
 
 def findings_table_generation(findingTableData, scan_type):  
-    tableStyle = TableStyle(
-        [
-            ("SPAN", (0, 0), (-1, 0)),
-            ("ALIGNMENT", (0, 0), (-1, 0), "CENTER"),
-            ("BOX", (0, 0), (-1, 0), 1, colors.black),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ]
-    )    
-
     if scan_type == "DYNAMIC":
         return findingTableData
         
-    tableTitle = Paragraph('Detailed ' + scan_type_names[scan_type] + ' Findings', styles['h4'])
+    tableTitle = Paragraph('Detailed ' + scan_type_names[scan_type] + ' Findings', h4_style)
     tableHeaders = get_table_header_for_scan_type(scan_type)
     scan_findings_table_array = [[tableTitle]] + tableHeaders + findingTableData  
     column_widths = get_column_widths_for_scan_type(scan_type)
     
-    findingTable = Table(
+    # findings tables can run to thousands of rows over many pages, which LongTable splits without re-measuring each part
+    findingTable = LongTable(
         scan_findings_table_array,
         column_widths,
         None,
-        tableStyle,
+        findings_table_style,
         2,
     )
     return [findingTable]
@@ -1161,61 +1306,66 @@ def _footer(canvas, doc, content):
     footer.drawOn(canvas, doc.leftMargin, h+40)
 
 
-def coverPage(canvas, doc):
-    # Save the state of our canvas so we can draw on it
-    canvas.saveState()
+def make_cover_page(page_width, copyright_year):
+    # page callbacks capture the report fields when the document is built instead of reading module globals per page
     copyright = "Copyright {} Veracode, Inc. <br/><br/>While every precaution has been taken in the preparation of this document, Veracode, Inc. assumes no responsibility for errors, omissions, or for damages resulting from the use of the information herein. The Veracode Platform uses static and/or dynamic analysis techniques to discover potentially exploitable flaws. Due to the nature of software security testing, the lack fof discoverable flaws does not mean the software is 100 percent secure".format(copyright_year)
-    copyright_footer = Paragraph(copyright, styles['hf'])
+    copyright_footer = Paragraph(copyright, hf_style)
     footerTableData = []
 
     footerTableData.append([copyright_footer])    
-    tstyle = TableStyle(
-        [('ALIGN', (1, 0), (-1, -1), 'LEFT')]
-    ) 
 
-    ft = Table(footerTableData, [doc.width])
-    ft.setStyle(tstyle)
-    _footer(canvas, doc, ft)
+    ft = Table(footerTableData, [page_width])
+    ft.setStyle(cover_footer_table_style)
+
+    def coverPage(canvas, doc):
+        # Save the state of our canvas so we can draw on it
+        canvas.saveState()
+        _footer(canvas, doc, ft)
+
+        # Release the canvas
+        canvas.restoreState()
 
-    # Release the canvas
-    canvas.restoreState()
+    return coverPage
 
 
-def otherPage(canvas, doc):
-    # Save the state of our canvas so we can draw on it
-    canvas.saveState()
+def make_other_page(page_width, collection_name, username, report_time, copyright_year):
+    # the header is the same on every page, so the logo is only loaded once per report
     headerTableData = []
 
-    collection = Paragraph("Collection: {}".format(collection_name), styles['hf'])
+    collection = Paragraph("Collection: {}".format(collection_name), hf_style)
     im = get_image(logo, .75*inch)
     headerTableData.append([collection, im])    
-    tstyle = TableStyle([("ALIGN", (1, 0), (-1, -1), "RIGHT")])
 
-    ht = Table(headerTableData, [0.5 * doc.width, 0.5 * doc.width])
-    ht.setStyle(tstyle)
-    _header(canvas, doc, ht)
+    ht = Table(headerTableData, [0.5 * page_width, 0.5 * page_width])
+    ht.setStyle(right_column_table_style)
 
+    # only the page number changes from page to page
     copyright_footer = Paragraph(
         "Copyright {} Veracode Inc.    Prepared {}     {} and Veracode Confidential".format(
             copyright_year, username, report_time
         ),
-        styles["hf"],
+        hf_style,
     )
-    footerTableData = []
 
-    page_number = Paragraph("Page {}".format(doc.page - 1), styles['hfr'])
+    def otherPage(canvas, doc):
+        # Save the state of our canvas so we can draw on it
+        canvas.saveState()
+        _header(canvas, doc, ht)
 
-    footerTableData.append([copyright_footer, page_number])    
-    tstyle = TableStyle(
-        [('ALIGN', (1, 0), (-1, -1), 'RIGHT')]
-    )
+        footerTableData = []
+
+        page_number = Paragraph("Page {}".format(doc.page - 1), hfr_style)
 
-    ft = Table(footerTableData, [0.8*doc.width, 0.2*doc.width])
-    ft.setStyle(tstyle)
-    _footer(canvas, doc, ft)
+        footerTableData.append([copyright_footer, page_number])    
 
-    # Release the canvas
-    canvas.restoreState()
+        ft = Table(footerTableData, [0.8*doc.width, 0.2*doc.width])
+        ft.setStyle(right_column_table_style)
+        _footer(canvas, doc, ft)
+
+        # Release the canvas
+        canvas.restoreState()
+
+    return otherPage
 
 
 def write_pdf_report(collection_info, report_name, landscape_orientation):
@@ -1228,7 +1378,8 @@ def write_pdf_report(collection_info, report_name, landscape_orientation):
                             leftMargin=.5*inch,
                             topMargin=72,
                             bottomMargin=72,
-                            pagesize=page_size)
+                            pagesize=page_size,
+                            pageCompression=1)
     global printable_width
     printable_width = doc.width * 0.95
     Story = [spacer]
@@ -1243,17 +1394,25 @@ def write_pdf_report(collection_info, report_name, landscape_orientation):
 
     # Enable to show page layout borders
     # doc.showBoundary = True 
-    doc.build(Story, onFirstPage=coverPage, onLaterPages=otherPage)
+    try:
+        doc.build(Story,
+                  onFirstPage=make_cover_page(doc.width, copyright_year),
+                  onLaterPages=make_other_page(doc.width, collection_name, username, report_time, copyright_year))
+    finally:
+        paragraph_cache.clear()
 
 # ******************************* #
 # CSV Generation section          #
 # ******************************* #
 
 
+# stands in for a missing cwe, cve or finding category in the CSV rows, to avoid a new empty dict per lookup. Never modified
+no_details = {}
+
 def write_csv_report(collection_info, csvFilename):
 
     # writing to csv file
-    with open(csvFilename, 'w') as csvfile:
+    with open(csvFilename, 'w', encoding='utf-8', newline='', buffering=1 << 20) as csvfile:
         # creating a csv writer object
         csvwriter = csv.writer(csvfile)
 
@@ -1280,47 +1439,48 @@ def write_csv_report(collection_info, csvFilename):
         ]
         # writing the fields
         csvwriter.writerow(header_fields)
-        # writing the data rows
+        # writing the data rows, one at a time as they are built
         findings_list = collection_info['findings_list']
-        data_rows = []
-
-        for profile in findings_list:
-            if profile != "collection_summary":
-                profileData = findings_list[profile]
-                app_findings = profileData["app_findings"]
-                for ap in app_findings:
-                    data_row = [
-                        profileData["asset_info"]["name"],
-                        str(ap.get("issue_id", '')),
-                        ap["scan_type"].capitalize(),
-                        severity[ap["finding_details"]["severity"]],
-                        str(ap["finding_details"].get("cwe", {}).get("id", "")),
-                        ap["finding_details"].get("cwe", {}).get("name", ""),
-                        ap["finding_details"].get("finding_category", {}).get("name", ""),
-                        ap["finding_details"].get("file_path", ""),
-                        str(ap["finding_details"].get("file_line_number", "")),
-                        ap["finding_details"].get("path", ""),
-                        ap["finding_details"].get("vulnerable_parameter", ""),
-                        str(ap["finding_details"].get("cve", {}).get("id", "")),
-                        ap["finding_details"].get("cve", {}).get("name", ""),
-                        ap["finding_details"].get("component_filename", ""),
-                        ap["finding_details"].get("version", ""),
-                        ap["finding_details"].get("input_vector", ""),
-                        ap.get("description", ""),
-                        ap["finding_status"]["status"].capitalize(),
-                        ap["finding_status"]["resolution"].capitalize(),
-                    ]
-                    data_rows.append(data_row)
-        csvwriter.writerows(data_rows)
+
+        for profileData in findings_list.values():
+            profile_name = profileData["asset_info"]["name"]
+            for ap in profileData["app_findings"]:
+                fd = ap["finding_details"]
+                fs = ap["finding_status"]
+                cwe = fd.get("cwe") or no_details
+                cve = fd.get("cve") or no_details
+                csvwriter.writerow([
+                    profile_name,
+                    str(ap.get("issue_id", '')),
+                    capitalize_status(ap["scan_type"]),
+                    severity[fd["severity"]],
+                    str(cwe.get("id", "")),
+                    cwe.get("name", ""),
+                    (fd.get("finding_category") or no_details).get("name", ""),
+                    fd.get("file_path", ""),
+                    str(fd.get("file_line_number", "")),
+                    fd.get("path", ""),
+                    fd.get("vulnerable_parameter", ""),
+                    str(cve.get("id", "")),
+                    cve.get("name", ""),
+                    fd.get("component_filename", ""),
+                    fd.get("version", ""),
+                    fd.get("input_vector", ""),
+                    ap.get("description", ""),
+                    capitalize_status(fs["status"]),
+                    capitalize_status(fs["resolution"]),
+                ])
 
 
 def list_of_strings(choices):
     """Return a function that splits and checks comma-separated values."""
+    # the list keeps its order for the error message
+    valid_choices = frozenset(choices)
 
     def splitarg(arg):
         values = arg.split(",")
         for value in values:
-            if value not in choices:
+            if value not in valid_choices:
                 raise argparse.ArgumentTypeError(
                     "invalid choice: {!r} (choose from {})".format(
                         value, ", ".join(map(repr, choices))
@@ -1380,16 +1540,33 @@ def main():
         required=False,
         action="store_true",
     )
+    parser.add_argument(
+        "--cache",
+        help="Keep downloaded findings on disk and reuse the ones downloaded earlier today with the same credentials.",
+        required=False,
+        action="store_true",
+    )
+    parser.add_argument(
+        "--debug",
+        help="Log debug messages and enable ReportLab shape checking.",
+        required=False,
+        action="store_true",
+    )
     args = parser.parse_args()
 
+    # set up logging first so the collection lookup below is logged too
+    setup_logger(args.debug)
+
     collguid = validate_collection_input(args)
 
     format = args.format
     scan_types = args.scan_types
     affects_policy = args.policy
     landscape_orientation = args.landscape
+    global use_findings_cache
+    use_findings_cache = args.cache
 
-    setup_logger()
+    cache_api_credentials()
 
     # CHECK FOR CREDENTIALS EXPIRATION
     creds_expire_days_warning()
@@ -1401,8 +1578,8 @@ def main():
     IS_DEBUG = False
     if IS_DEBUG:
         # Opening JSON file - Use for local testing to skip api calls
-        with open('sample_collection.json', 'r') as openfile:
-            collection_info = json.load(openfile)
+        with open('sample_collection.json', 'r', encoding='utf-8') as openfile:
+            collection_info = load_json(openfile)
     else: 
         collection_info = get_collection_information(collguid, scan_types, affects_policy)
 
@@ -1427,8 +1604,9 @@ def main():
     # write collection to local file for offline testing
     if 'json' in format:
         jsonFilename = outputFilename+".json"
-        with open(jsonFilename, "w") as outfile:
-            json.dump(collection_info, outfile)
+        # orjson writes non-ASCII characters as they are, so don't rely on the locale encoding
+        with open(jsonFilename, "w", encoding='utf-8') as outfile:
+            dump_json(collection_info, outfile)
         jsonLog = "Wrote JSON file: {}".format(jsonFilename)
         print(jsonLog)
         log.info(jsonLog)
@@ -1454,23 +1632,20 @@ def main():
 def validate_collection_input(args):
     if (args.name is not None):
        name = str(args.name)
-       collections =  Collections().get_by_name(name)
-       found = False
-       for collection in collections:
-           if (collection.get("name") == name):
-              found = True
-              collguid = collection.get("guid")
-              status = "Guid for collection: {} is {}".format(name,collguid)
-              print(status)
-              log.info(status)
-              break
-
-       if (not found):
+       collections =  collections_api.get_by_name(name)
+       # the name search can return more than the exact match, so take the first collection with exactly this name
+       collection = next((collection for collection in collections if collection.get("name") == name), None)
+       if (collection is None):
           status = "Collection: {} does not exist".format(name)
           print(status)
           log.info(status)
           exit(1)
 
+       collguid = collection.get("guid")
+       status = "Guid for collection: {} is {}".format(name,collguid)
+       print(status)
+       log.info(status)
+
     elif (args.collectionsid is not None):
        collguid = args.collectionsid
     else: